@@ -21,6 +21,9 @@ from collections import defaultdict
 from typing import Any, cast
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import streamlit as st
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
@@ -34,7 +37,7 @@ from app_settings import (
     get_database_loader_message,
     get_database_logo,
 )
-from helpers import state_empty, state_init
+from helpers import state_empty, state_init, to_csv_bytes
 
 from utils.api import (
     cleanse_dataframes,
@@ -47,6 +50,7 @@ from utils.schema import (
     AnalystDataset,
     CleansedColumnReport,
     CleansedDataset,
+    DataDictionary,
 )
 
 warnings.filterwarnings("ignore")
@@ -62,12 +66,148 @@ logger = logging.getLogger(__name__)
 # Initialize session state variables
 state_init(st.session_state)
 
+# Parse CSV uploads in 8MB blocks so pyarrow can tokenize them in parallel
+CSV_BLOCK_SIZE = 8 << 20
+
+# Number of rows loaded per file when quick preview is enabled
+QUICK_PREVIEW_ROWS = 1000
+
+# pd.read_csv's default missing-value markers; pyarrow's own list lacks "None"
+# and "<NA>"
+CSV_NULL_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+
+def dedup_column_names(names: list[str]) -> list[str]:
+    """Name blank and repeated CSV headers the way pd.read_csv does
+
+    Follows the C parser's scheme, which also skips suffixes already taken by
+    another header (a,a,a.1 becomes a,a.2,a.1).
 
-def process_uploaded_file(file: UploadedFile) -> list[AnalystDataset]:
+    Args:
+        names: Header names as read from the file
+    Returns:
+        list[str]: Names with blanks as "Unnamed: i" and repeats as "name.n"
+    """
+    header = [name if name != "" else f"Unnamed: {i}" for i, name in enumerate(names)]
+    counts: dict[str, int] = {}
+    for i, name in enumerate(header):
+        count = counts.get(name, 0)
+        if count > 0:
+            base = name
+            while count > 0:
+                counts[base] = count + 1
+                name = f"{base}.{count}"
+                count = count + 1 if name in header else counts.get(name, 0)
+            header[i] = name
+        counts[name] = count + 1
+    return header
+
+
+def read_csv_table(file: UploadedFile, nrows: int | None = None) -> pa.Table:
+    """Parse an uploaded CSV file with pyarrow's multithreaded reader
+
+    Args:
+        file: The uploaded file object
+        nrows: Stop reading after this many rows, or read the whole file if None
+    Returns:
+        pa.Table: The parsed data
+    """
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE)
+    # Match pandas: empty and "NA"-like strings become missing values
+    convert_options = pacsv.ConvertOptions(
+        null_values=CSV_NULL_VALUES, strings_can_be_null=True
+    )
+
+    if nrows is None:
+        return pacsv.read_csv(
+            file, read_options=read_options, convert_options=convert_options
+        )
+
+    # Stream blocks and stop as soon as enough rows have been read
+    reader = pacsv.open_csv(
+        file, read_options=read_options, convert_options=convert_options
+    )
+    batches = []
+    rows_read = 0
+    for batch in reader:
+        batches.append(batch)
+        rows_read += batch.num_rows
+        if rows_read >= nrows:
+            break
+    return pa.Table.from_batches(batches, schema=reader.schema).slice(0, nrows)
+
+
+def has_int64_overflow(table: pa.Table) -> bool:
+    """Whether a float column holds whole numbers beyond the int64 range
+
+    pyarrow reads such integers (long numeric IDs, for example) as doubles and
+    drops digits, where pd.read_csv keeps them exactly.
+    """
+    for column in table.columns:
+        if pa.types.is_floating(column.type):
+            large = pc.greater_equal(pc.abs(column), 2.0**63)
+            whole = pc.equal(pc.floor(column), column)
+            if pc.any(pc.and_(large, whole)).as_py():
+                return True
+    return False
+
+
+def read_csv(file: UploadedFile, nrows: int | None = None) -> pd.DataFrame:
+    """Parse an uploaded CSV file, with pyarrow where it reads it like pandas
+
+    Args:
+        file: The uploaded file object
+        nrows: Stop reading after this many rows, or read the whole file if None
+    Returns:
+        pd.DataFrame: The parsed data
+    """
+    try:
+        table = read_csv_table(file, nrows=nrows)
+    except pa.ArrowInvalid as e:
+        # e.g. rows with fewer fields than the header, which pandas pads
+        logger.info(f"Falling back to pandas for {file.name}: {e}")
+        table = None
+
+    if table is None or has_int64_overflow(table):
+        file.seek(0)
+        return pd.read_csv(file, nrows=nrows)
+
+    # pyarrow keeps blank and repeated headers as they are
+    table = table.rename_columns(dedup_column_names(table.column_names))
+
+    # self_destruct releases the Arrow buffers as columns are converted
+    df: pd.DataFrame = table.to_pandas(date_as_object=False, self_destruct=True)
+    return df
+
+
+def process_uploaded_file(
+    file: UploadedFile, nrows: int | None = None
+) -> list[AnalystDataset]:
     """Process a single uploaded file and return a list of (dataset_name, dataframe) tuples
 
     Args:
         file: The uploaded file object
+        nrows: Only read the first nrows rows of each dataset, or all rows if None
     Returns:
         list: List of (dataset_name, dataframe) tuples, or empty list if error
     """
@@ -77,29 +217,26 @@ def process_uploaded_file(file: UploadedFile) -> list[AnalystDataset]:
         results = []
 
         if file_extension == ".csv":
-            df = pd.read_csv(file)
+            df = read_csv(file, nrows=nrows)
             dataset_name = os.path.splitext(file.name)[0]
-            data = cast(list[dict[str, Any]], df.to_dict(orient="records"))
-            results.append(AnalystDataset(name=dataset_name, data=data))
+            results.append(AnalystDataset(name=dataset_name, data=df))
             logger.info(
                 f"Loaded CSV {dataset_name}: {len(df)} 行, {len(df.columns)} 列"
             )
 
         elif file_extension in [".xlsx", ".xls"]:
-            # Read all sheets
-            excel_file = pd.ExcelFile(file)
+            # Read all sheets in a single pass over the workbook
+            sheets = pd.read_excel(
+                file, sheet_name=None, engine="calamine", nrows=nrows
+            )
             base_name = os.path.splitext(file.name)[0]
 
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            for sheet_name, df in sheets.items():
                 # Use sheet name as dataset name if multiple sheets, otherwise use file name
                 dataset_name = (
-                    f"{base_name}_{sheet_name}"
-                    if len(excel_file.sheet_names) > 1
-                    else base_name
+                    f"{base_name}_{sheet_name}" if len(sheets) > 1 else base_name
                 )
-                data = cast(list[dict[str, Any]], df.to_dict(orient="records"))
-                results.append(AnalystDataset(name=dataset_name, data=data))
+                results.append(AnalystDataset(name=dataset_name, data=df))
                 logger.info(
                     f"Loaded Excel sheet {dataset_name}: {len(df)} rows, {len(df.columns)} columns"
                 )
@@ -113,6 +250,16 @@ def process_uploaded_file(file: UploadedFile) -> list[AnalystDataset]:
         return []
 
 
+@st.cache_data(show_spinner="AIカタログのデータセットをロード中...")
+def get_catalog_dataset_options() -> list[dict[str, Any]]:
+    """AI Catalog datasets as multiselect options
+
+    list_catalog_datasets already caches the listing for the process lifetime;
+    this only avoids dumping every dataset model again on each rerun.
+    """
+    return [i.model_dump() for i in list_catalog_datasets()]
+
+
 def clear_data_callback() -> None:
     """Callback function to clear all data from session state and cache"""
     # Clear session state
@@ -120,8 +267,45 @@ def clear_data_callback() -> None:
     st.session_state.file_uploader_key += 1  # Used to clear file_uploader
 
 
+async def cleanse_and_describe(
+    dataset: AnalystDataset,
+) -> tuple[AnalystDataset, CleansedDataset | None, list[DataDictionary]]:
+    """Cleanse a dataset and generate the data dictionary for the result
+
+    Args:
+        dataset: The dataset to process
+    Returns:
+        tuple: The dataset to analyze, its cleansing result (None if cleansing
+            was skipped or failed) and its generated data dictionaries
+    """
+    analysis_dataset = dataset
+    cleansed_dataset = None
+    if st.session_state.data_source != DataSource.DATABASE:
+        try:
+            [cleansed_dataset] = await cleanse_dataframes([dataset])
+            analysis_dataset = cleansed_dataset.dataset
+        except Exception as e:
+            logger.error(f"Data processing failed for {dataset.name}")
+            st.error(f"❌ Error processing data: {str(e)}")
+
+    logger.info(f"Generating dictionary for {dataset.name}")
+    dictionaries: list[DataDictionary] = []
+    try:
+        dictionaries = await get_dictionaries([analysis_dataset])
+    except Exception:
+        st.warning(
+            "⚠️ データは処理されましたが、一部のデータディクショナリーの生成中に問題が発生しました"
+        )
+    return analysis_dataset, cleansed_dataset, dictionaries
+
+
 async def process_data_and_update_state(datasets: list[AnalystDataset]) -> None:
-    new_dataset_names = [ds.name for ds in datasets]
+    # Files in one batch can yield the same dataset name (sales.csv and
+    # sales.xlsx); keep the last, as loading them one after another would
+    datasets = list({ds.name: ds for ds in datasets}.values())
+    new_dataset_names = {ds.name for ds in datasets}
+    # Replaced datasets are full loads unless the upload callback says otherwise
+    st.session_state.preview_dataset_names -= new_dataset_names
 
     st.session_state.datasets = [
         ds for ds in st.session_state.datasets if ds.name not in new_dataset_names
@@ -129,43 +313,28 @@ async def process_data_and_update_state(datasets: list[AnalystDataset]) -> None:
     st.session_state.cleansed_data = [
         ds for ds in st.session_state.cleansed_data if ds.name not in new_dataset_names
     ]
+    st.session_state.data_dictionaries = [
+        d for d in st.session_state.data_dictionaries if d.name not in new_dataset_names
+    ]
 
     # Add the new (or updated) datasets to the session state
 
     for ds in datasets:
-        st.success(f"✓ {ds.name}: {len(ds.to_df())} 行, {len(ds.columns)} 列")
+        st.success(f"✓ {ds.name}: {ds.row_count} 行, {len(ds.columns)} 列")
 
-    # Process the new data
+    # Process the new data; each dataset's dictionary is requested as soon as
+    # it has been cleansed, overlapping with the cleansing of the others
     logger.info("Starting data processing")
-    analysis_datasets = datasets
-    if st.session_state.data_source != DataSource.DATABASE:
-        try:
-            cleansed_datasets = await cleanse_dataframes(datasets)
-            st.session_state.cleansed_data.extend(cleansed_datasets)
-            analysis_datasets = [ds.dataset for ds in cleansed_datasets]
-        except Exception as e:
-            logger.error("Data processing failed")
-            st.error(f"❌ Error processing data: {str(e)}")
-
-    st.session_state.datasets.extend(analysis_datasets)
-    logger.info("Data processing successful, generating dictionaries")
-
-    new_dictionaries = []
+    results = await asyncio.gather(*(cleanse_and_describe(ds) for ds in datasets))
 
-    # Generate data dictionaries
-    try:
-        new_dictionaries = await get_dictionaries(analysis_datasets)
-
-        st.session_state.data_dictionaries += [
-            d
-            for d in new_dictionaries
-            if d.name not in [d.name for d in st.session_state.data_dictionaries]
-        ]
+    new_dictionaries: list[DataDictionary] = []
+    for analysis_dataset, cleansed_dataset, dictionaries in results:
+        if cleansed_dataset is not None:
+            st.session_state.cleansed_data.append(cleansed_dataset)
+        st.session_state.datasets.append(analysis_dataset)
+        new_dictionaries.extend(dictionaries)
 
-    except Exception:
-        st.warning(
-            "⚠️ データは処理されましたが、一部のデータディクショナリーの生成中に問題が発生しました"
-        )
+    st.session_state.data_dictionaries.extend(new_dictionaries)
     if len(new_dictionaries) > 0:
         st.toast("データが正常に処理され、データディクショナリーが生成されました。", icon="✅")
 
@@ -183,7 +352,9 @@ async def catalog_download_callback() -> None:
                 selected_ids = [
                     ds["id"] for ds in st.session_state.selected_catalog_datasets
                 ]
-                dataframes = download_catalog_datasets(*selected_ids)
+                dataframes = await asyncio.to_thread(
+                    download_catalog_datasets, *selected_ids
+                )
 
                 await process_data_and_update_state(dataframes)
 
@@ -198,7 +369,9 @@ async def load_from_database_callback() -> None:
     ):
         with st.sidebar:
             with st.spinner("選択したテーブルをロード中..."):
-                dataframes = Database.get_data(*st.session_state.selected_schema_tables)
+                dataframes = await asyncio.to_thread(
+                    Database.get_data, *st.session_state.selected_schema_tables
+                )
 
                 if not dataframes:
                     st.error(f"Failed to load data from {app_infra.database}")
@@ -207,18 +380,42 @@ async def load_from_database_callback() -> None:
                 await process_data_and_update_state(dataframes)
 
 
-async def uploaded_file_callback(uploaded_files: list[UploadedFile]) -> None:
-    """Callback function for file uploads"""
+async def uploaded_file_callback(
+    uploaded_files: list[UploadedFile], nrows: int | None = None
+) -> None:
+    """Callback function for file uploads
+
+    Files are tracked by (file_id, nrows), so turning quick preview off re-reads
+    previewed files in full and replaces their datasets. A file that was already
+    read in full is never replaced by a preview.
+    """
     # Set flag to indicate data source is a file
     st.session_state.data_source = DataSource.FILE
 
+    processed = st.session_state.processed_file_ids
+    new_files = [
+        file
+        for file in uploaded_files
+        if (file.file_id, None) not in processed
+        and (file.file_id, nrows) not in processed
+    ]
+    if not new_files:
+        return
+
     with st.spinner("ファイルの読み込みと処理実行中..."):
-        # Process uploaded files
-        for file in uploaded_files:
-            if file.file_id not in st.session_state.processed_file_ids:
-                dataset_results = process_uploaded_file(file)
-                await process_data_and_update_state(dataset_results)
-                st.session_state.processed_file_ids.append(file.file_id)
+        # Parse all new files in parallel, then process them as one batch
+        dataset_results = await asyncio.gather(
+            *(
+                asyncio.to_thread(process_uploaded_file, file, nrows)
+                for file in new_files
+            )
+        )
+        datasets = [ds for parsed in dataset_results for ds in parsed]
+        await process_data_and_update_state(datasets)
+        if nrows is not None:
+            st.session_state.preview_dataset_names |= {ds.name for ds in datasets}
+        for file in new_files:
+            processed.add((file.file_id, nrows))
 
 
 # Page config
@@ -229,6 +426,123 @@ st.set_page_config(page_title="Connect Data", page_icon=PAGE_ICON, layout="wide"
 apply_custom_css()
 
 
+@st.fragment
+def render_dataset(
+    ds_display: AnalystDataset, cleaning_report: list[CleansedColumnReport] | None
+) -> None:
+    """Render a dataset's cleaning report, preview and download button
+
+    Runs as a fragment so the column filter and row count widgets only rerun
+    this block instead of the whole page.
+
+    Args:
+        ds_display: The dataset to render
+        cleaning_report: The dataset's cleaning report, if it was cleansed
+    """
+    st.subheader(f"{ds_display.name}")
+    df_display = ds_display.to_df()
+    if ds_display.name in st.session_state.preview_dataset_names:
+        st.info(
+            f"クイックプレビュー: 先頭{QUICK_PREVIEW_ROWS}行のみ読み込まれています。"
+            "全行を読み込むにはクイックプレビューをオフにしてください"
+        )
+    if cleaning_report is None:
+        st.warning("このデータセットのクリーニングレポートはありません")
+    else:
+        # Display cleaning report in expander
+        with st.expander("クリーニングレポートの表示"):
+            # Group reports by conversion type
+            conversions: defaultdict[str, list[CleansedColumnReport]] = defaultdict(
+                list
+            )
+
+            for col_report in cleaning_report:
+                if col_report.conversion_type:
+                    conversions[col_report.conversion_type].append(col_report)
+
+            # Display summary of changes
+            if conversions:
+                st.write("### 変更点のサマリー")
+                for conv_type, reports in conversions.items():
+                    columns_count = len(reports)
+                    st.write(
+                        f"**{conv_type}** ({columns_count} {'column' if columns_count == 1 else 'columns'})"
+                    )
+                    for report in reports:
+                        with st.container():
+                            st.markdown(f"### {report.new_column_name}")
+                            if report.original_column_name:
+                                st.write(f"元名: `{report.original_column_name}`")
+                            if report.original_dtype:
+                                st.write(
+                                    f"型変換: `{report.original_dtype}` → `{report.new_dtype}`"
+                                )
+
+                            # Show warnings if any
+                            if report.warnings:
+                                st.write("**Warnings:**")
+                                for warning in report.warnings:
+                                    st.markdown(f"- {warning}")
+
+                            # Show errors if any
+                            if report.errors:
+                                st.error("**Errors:**")
+                                for error in report.errors:
+                                    st.markdown(f"- {error}")
+            else:
+                st.info("クリーニング中に列は変更されませんでした")
+
+            # Show unchanged columns
+            unchanged = [r for r in cleaning_report if not r.conversion_type]
+            if unchanged:
+                st.write("### 変更されなかった列")
+                st.write(", ".join(f"`{r.new_column_name}`" for r in unchanged))
+
+    # Create column filters
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search = st.text_input(
+            "列選択",
+            key=f"search_{ds_display.name}",
+            help="列名でフィルター",
+        )
+    with col2:
+        n_rows = int(
+            st.number_input(
+                "表示する行数",
+                min_value=1,
+                max_value=ds_display.row_count,
+                value=min(10, ds_display.row_count),
+                step=1,
+                key=f"n_rows_{ds_display.name}",
+            )
+        )
+
+    # Filter columns based on search
+    if search:
+        matches = df_display.columns.str.contains(search, case=False, regex=False)
+        cols = df_display.columns[matches].tolist()
+    else:
+        cols = df_display.columns.tolist()
+
+    # Display filtered dataframe
+    st.dataframe(ds_display.preview(cols, n_rows), use_container_width=True)
+
+    # Download button
+    col1, col2, col3 = st.columns([1, 3, 1])
+    with col1:
+        csv = to_csv_bytes(df_display)
+        st.download_button(
+            label="クレンジングされたデータをダウンロード",
+            data=csv,
+            file_name=f"{ds_display.name}_cleansed.csv",
+            mime="text/csv",
+            key=f"download_{ds_display.name}",
+        )
+
+    st.markdown("---")
+
+
 async def main() -> None:
     # Sidebar for data upload and processing
     with st.sidebar:
@@ -249,15 +563,22 @@ async def main() -> None:
                 disabled=st.session_state.data_source == DataSource.DATABASE,
                 key=st.session_state.file_uploader_key,
             )
+            quick_preview = st.checkbox(
+                "クイックプレビュー",
+                key="quick_preview",
+                help=f"各ファイルの先頭{QUICK_PREVIEW_ROWS}行のみを読み込み、大きなファイルをすばやく確認します。オフにすると全行を読み込み直します",
+                disabled=st.session_state.data_source == DataSource.DATABASE,
+            )
             if uploaded_files:
-                await uploaded_file_callback(uploaded_files)
+                await uploaded_file_callback(
+                    uploaded_files, nrows=QUICK_PREVIEW_ROWS if quick_preview else None
+                )
 
             # AI Catalog section
             st.subheader("☁️   DataRobot AIカタログ")
 
             # Get datasets from catalog
-            with st.spinner("AIカタログのデータセットをロード中..."):
-                datasets = [i.model_dump() for i in list_catalog_datasets()]
+            datasets = get_catalog_dataset_options()
 
             # Create form for dataset selection
             with st.form("catalog_selection_form", border=False):
@@ -335,117 +656,12 @@ async def main() -> None:
         st.session_state.cleansed_data = cast(
             list[CleansedDataset], st.session_state.cleansed_data
         )
+        reports_by_name: dict[str, list[CleansedColumnReport]] = {
+            clean_ds.name: clean_ds.cleaning_report
+            for clean_ds in st.session_state.cleansed_data
+        }
         for ds_display in st.session_state.datasets:
-            st.subheader(f"{ds_display.name}")
-            cleaning_report: list[CleansedColumnReport] | None = None
-            try:
-                cleaning_report = next(
-                    clean_ds.cleaning_report
-                    for clean_ds in st.session_state.cleansed_data
-                    if clean_ds.name == ds_display.name
-                )
-
-                # Display cleaning report in expander
-                with st.expander("クリーニングレポートの表示"):
-                    # Group reports by conversion type
-                    conversions: defaultdict[str, list[CleansedColumnReport]] = (
-                        defaultdict(list)
-                    )
-
-                    for col_report in cleaning_report:
-                        if col_report.conversion_type:
-                            conversions[col_report.conversion_type].append(col_report)
-
-                    # Display summary of changes
-                    if conversions:
-                        st.write("### 変更点のサマリー")
-                        for conv_type, reports in conversions.items():
-                            columns_count = len(reports)
-                            st.write(
-                                f"**{conv_type}** ({columns_count} {'column' if columns_count == 1 else 'columns'})"
-                            )
-                            for report in reports:
-                                with st.container():
-                                    st.markdown(f"### {report.new_column_name}")
-                                    if report.original_column_name:
-                                        st.write(
-                                            f"元名: `{report.original_column_name}`"
-                                        )
-                                    if report.original_dtype:
-                                        st.write(
-                                            f"型変換: `{report.original_dtype}` → `{report.new_dtype}`"
-                                        )
-
-                                    # Show warnings if any
-                                    if report.warnings:
-                                        st.write("**Warnings:**")
-                                        for warning in report.warnings:
-                                            st.markdown(f"- {warning}")
-
-                                    # Show errors if any
-                                    if report.errors:
-                                        st.error("**Errors:**")
-                                        for error in report.errors:
-                                            st.markdown(f"- {error}")
-                    else:
-                        st.info("クリーニング中に列は変更されませんでした")
-
-                    # Show unchanged columns
-                    unchanged = [r for r in cleaning_report if not r.conversion_type]
-                    if unchanged:
-                        st.write("### 変更されなかった列")
-                        st.write(", ".join(f"`{r.new_column_name}`" for r in unchanged))
-
-            except StopIteration:
-                st.warning("このデータセットのクリーニングレポートはありません")
-
-            # Display dataframe with column filters
-            df_display = ds_display.to_df()
-
-            # Create column filters
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                search = st.text_input(
-                    "列選択",
-                    key=f"search_{ds_display.name}",
-                    help="列名でフィルター",
-                )
-            with col2:
-                n_rows = int(
-                    st.number_input(
-                        "表示する行数",
-                        min_value=1,
-                        max_value=len(df_display),
-                        value=min(10, len(df_display)),
-                        step=1,
-                        key=f"n_rows_{ds_display.name}",
-                    )
-                )
-
-            # Filter columns based on search
-            if search:
-                cols = [
-                    col for col in df_display.columns if search.lower() in col.lower()
-                ]
-            else:
-                cols = df_display.columns.tolist()
-
-            # Display filtered dataframe
-            st.dataframe(df_display[cols].head(n_rows), use_container_width=True)
-
-            # Download button
-            col1, col2, col3 = st.columns([1, 3, 1])
-            with col1:
-                csv = df_display.to_csv(index=False)
-                st.download_button(
-                    label="クレンジングされたデータをダウンロード",
-                    data=csv,
-                    file_name=f"{ds_display.name}_cleansed.csv",
-                    mime="text/csv",
-                    key=f"download_{ds_display.name}",
-                )
-
-            st.markdown("---")
+            render_dataset(ds_display, reports_by_name.get(ds_display.name))
 
 
 if __name__ == "__main__":
@@ -12,14 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import json
 import logging
+import pickle
 import time
 import traceback
 from copy import deepcopy
 from datetime import datetime
 from typing import Any, Callable, Coroutine, TypeVar
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import streamlit as st
 from streamlit.runtime.state import SessionStateProxy
 from typing_extensions import ParamSpec
 
@@ -189,6 +195,66 @@ def log_error_details(error: BaseException, context: dict[str, Any]) -> None:
     )
 
 
+def frame_fingerprint(df: pd.DataFrame) -> tuple[Any, ...]:
+    """Cache key covering every row of a DataFrame
+
+    Streamlit's default DataFrame hash only samples rows of large frames, so an
+    edit outside the sample would be served the previous result.
+
+    Args:
+        df: The DataFrame to fingerprint
+    Returns:
+        tuple: Column labels, dtypes and per-row hashes
+    """
+    try:
+        rows = pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+    except TypeError:
+        # Unhashable cell values such as lists are fingerprinted via pickle
+        rows = pickle.dumps(df)
+    return (df.columns.tolist(), df.dtypes.astype(str).tolist(), rows)
+
+
+# Seconds a serialized CSV download stays cached
+CSV_CACHE_TTL = 600
+
+
+@st.cache_data(
+    show_spinner=False,
+    max_entries=16,
+    ttl=CSV_CACHE_TTL,
+    hash_funcs={pd.DataFrame: frame_fingerprint},
+)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV, cached so reruns don't re-serialize it
+
+    Uses Arrow's CSV formatting (quoted header, lowercase booleans, full
+    timestamp precision) when the frame converts, otherwise pandas'.
+
+    Args:
+        df: The DataFrame to serialize
+    Returns:
+        bytes: UTF-8 encoded CSV without the index
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Arrow's CSV writer has no representation for list/struct columns, and
+        # writes durations as raw integers and times with fractional seconds
+        if not any(
+            pa.types.is_nested(field.type)
+            or pa.types.is_duration(field.type)
+            or pa.types.is_time(field.type)
+            for field in table.schema
+        ):
+            # pyarrow's writer is multithreaded and writes straight from Arrow buffers
+            buf = io.BytesIO()
+            pacsv.write_csv(table, buf)
+            return buf.getvalue()
+    except (pa.ArrowException, ValueError):
+        # Mixed-type objects and duplicate column labels can't go through Arrow
+        pass
+    return df.to_csv(index=False).encode()
+
+
 empty_session_state = {
     "initialized": True,
     "datasets": [],
@@ -197,7 +263,8 @@ empty_session_state = {
     "selected_catalog_datasets": [],
     "data_source": None,
     "file_uploader_key": 0,
-    "processed_file_ids": [],
+    "processed_file_ids": set(),
+    "preview_dataset_names": set(),
     "chat_messages": [],
     "chat_input_key": 0,
     "debug_mode": True,
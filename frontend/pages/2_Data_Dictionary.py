@@ -22,7 +22,7 @@ from pandas import DataFrame
 
 sys.path.append("..")
 from app_settings import PAGE_ICON, apply_custom_css, display_page_logo
-from helpers import state_init
+from helpers import state_init, to_csv_bytes
 
 from utils.schema import DataDictionary
 
@@ -43,6 +43,12 @@ display_page_logo()
 st.title("データディクショナリー")
 
 
+@st.cache_data(show_spinner=False)
+def dictionary_to_df(dictionary: DataDictionary) -> DataFrame:
+    """Convert a dictionary to its editable DataFrame, cached across reruns"""
+    return dictionary.to_application_df()
+
+
 def save(dictionary: DataDictionary, edited_df: DataFrame) -> None:
     edited = DataDictionary.from_application_df(edited_df, dictionary.name)
     st.session_state.data_dictionaries = [
@@ -51,6 +57,62 @@ def save(dictionary: DataDictionary, edited_df: DataFrame) -> None:
     ]
 
 
+@st.fragment
+def render_dictionary(dictionary: DataDictionary) -> None:
+    """Render the editor, save and download controls for one dictionary
+
+    Runs as a fragment so edits in the data editor only rerun this block.
+    """
+    st.subheader(dictionary.name)
+    logger.info(f"Processing dictionary for {dictionary.name}")
+
+    try:
+        # Convert dictionary to DataFrame
+        dict_df = dictionary_to_df(dictionary)
+        logger.info(
+            f"Created DataFrame for {dictionary.name} with shape {dict_df.shape}"
+        )
+
+        # Make dictionary editable
+        edited_df = st.data_editor(
+            dict_df,
+            use_container_width=True,
+            num_rows="dynamic",
+            key=f"dict_editor_{dictionary.name}",
+        )
+
+        col1, col2, col3 = st.columns([2, 3, 1])
+
+        with col3:
+            st.button(
+                label="Save changes",
+                on_click=save,
+                args=(dictionary, edited_df),
+                key=f"dict_save_{dictionary.name}",
+                use_container_width=True,
+            )
+
+        with col1:
+            # Download button for dictionary
+            csv = to_csv_bytes(edited_df)
+            st.download_button(
+                label="Download Data Dictionary",
+                data=csv,
+                file_name=f"{dictionary.name}_dictionary.csv",
+                mime="text/csv",
+                key=f"download_dict_{dictionary.name}",
+            )
+
+    except Exception as e:
+        logger.error(
+            f"Error processing dictionary for {dictionary.name}: {str(e)}",
+            exc_info=True,
+        )
+        st.error(f"Error displaying dictionary for {dictionary.name}: {str(e)}")
+
+    st.markdown("---")
+
+
 async def main() -> None:
     if (
         "data_dictionaries" not in st.session_state
@@ -71,54 +133,7 @@ async def main() -> None:
             list[DataDictionary], st.session_state.data_dictionaries
         )
         for dictionary in st.session_state.data_dictionaries:
-            st.subheader(dictionary.name)
-            logger.info(f"Processing dictionary for {dictionary.name}")
-
-            try:
-                # Convert dictionary to DataFrame
-                dict_df = dictionary.to_application_df()
-                logger.info(
-                    f"Created DataFrame for {dictionary.name} with shape {dict_df.shape}"
-                )
-
-                # Make dictionary editable
-                edited_df = st.data_editor(
-                    dict_df,
-                    use_container_width=True,
-                    num_rows="dynamic",
-                    key=f"dict_editor_{dictionary.name}",
-                )
-
-                col1, col2, col3 = st.columns([2, 3, 1])
-
-                with col3:
-                    st.button(
-                        label="Save changes",
-                        on_click=save,
-                        args=(dictionary, edited_df),
-                        key=f"dict_save_{dictionary.name}",
-                        use_container_width=True,
-                    )
-
-                with col1:
-                    # Download button for dictionary
-                    csv = edited_df.to_csv(index=False)
-                    st.download_button(
-                        label="Download Data Dictionary",
-                        data=csv,
-                        file_name=f"{dictionary.name}_dictionary.csv",
-                        mime="text/csv",
-                        key=f"download_dict_{dictionary.name}",
-                    )
-
-            except Exception as e:
-                logger.error(
-                    f"Error processing dictionary for {dictionary.name}: {str(e)}",
-                    exc_info=True,
-                )
-                st.error(f"Error displaying dictionary for {dictionary.name}: {str(e)}")
-
-            st.markdown("---")
+            render_dictionary(dictionary)
 
     # Add helpful tips
     with st.sidebar:
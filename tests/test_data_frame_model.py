@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import logging
+import pickle
 from typing import Any
 
 import pandas as pd
@@ -20,7 +21,7 @@ import pytest
 from pandas.testing import assert_frame_equal
 from pydantic import ValidationError
 
-from utils.schema import AnalystDataset
+from utils.schema import AnalystDataset, DictionaryGeneration
 
 
 @pytest.fixture
@@ -29,6 +30,7 @@ def data() -> dict[str, Any]:
     return {
         "df": pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}),
         "records": [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}, {"a": 3, "b": "z"}],
+        "columns": {"a": [1, 2, 3], "b": ["x", "y", "z"]},
     }
 
 
@@ -43,6 +45,14 @@ class TestDatasetInput:
         # assert isinstance(model.data, pd.DataFrame)
         assert_frame_equal(model.to_df(), data["df"])
 
+    def test_accepts_columns(self, data: dict[str, Any]) -> None:
+        model = AnalystDataset(data=data["columns"], name="test")
+        assert_frame_equal(model.to_df(), data["df"])
+
+    def test_rejects_ragged_columns(self) -> None:
+        with pytest.raises(ValidationError, match="dict of equal-length columns"):
+            AnalystDataset(data={"a": [1, 2], "b": ["x"]}, name="test")
+
     def test_serialization(self, data: dict[str, Any]) -> None:
         model = AnalystDataset(data=data["df"], name="test")
         serialized = model.model_dump_json()
@@ -51,6 +61,61 @@ class TestDatasetInput:
 
         assert_frame_equal(deserialized.to_df(), data["df"])
 
+    @pytest.mark.parametrize(
+        "df",
+        [
+            pd.DataFrame(
+                {
+                    "a": [1, None, 3],
+                    "b": ["x", None, "z"],
+                    "c": pd.date_range("2024-01-01", periods=3),
+                },
+                index=["row1", "row2", "row3"],
+            ),
+            pd.DataFrame({"mixed": [1, "a", None]}),
+            pd.DataFrame({"nested": [[1], [2, 3], []]}),
+            pd.DataFrame({"ints": pd.Series([1, None, 3], dtype=object)}),
+            pd.DataFrame({"numbers": pd.Series([1, 2.5], dtype=object)}),
+            pd.DataFrame([[1, "x"], [2, "y"]], columns=["a", "a"]),
+            pd.DataFrame({"a": [1, 2], 2: ["x", "y"]}),
+        ],
+        ids=[
+            "arrow",
+            "mixed",
+            "nested",
+            "object-ints",
+            "object-numbers",
+            "dup",
+            "mixed-labels",
+        ],
+    )
+    def test_pickle_roundtrip(self, df: pd.DataFrame) -> None:
+        model = AnalystDataset(data=df, name="test")
+        restored = pickle.loads(pickle.dumps(model))
+        assert restored.name == "test"
+        assert_frame_equal(restored.to_df(), df)
+
+    def test_records_are_cached(self, data: dict[str, Any]) -> None:
+        model = AnalystDataset(data=data["df"], name="test")
+        assert model.data_records is model.data_records
+        assert model.data_records == data["records"]
+
+        model.data.df = data["df"].head(1).copy()
+        assert model.data_records == data["records"][:1]
+
+        model.to_df()["b"] = "z"
+        records = model.data_records
+        assert isinstance(records, list)
+        assert [r["b"] for r in records] == ["z"]
+
+    def test_columns_are_cached(self, data: dict[str, Any]) -> None:
+        model = AnalystDataset(data=data["df"].copy(), name="test")
+        assert model.columns is model.columns
+        assert model.columns == ["a", "b"]
+
+        model.to_df()["c"] = 0
+        assert model.columns == ["a", "b", "c"]
+
     def test_empty_dataframe(self) -> None:
         empty_df = pd.DataFrame(columns=["a", "b"])
         model = AnalystDataset(data=empty_df, name="test")
@@ -61,6 +126,7 @@ class TestDatasetInput:
         single_row_df = pd.DataFrame({"a": [1], "b": ["x"]})
         model = AnalystDataset(data=single_row_df, name="test")
         assert len(model.to_df()) == 1
+        assert model.row_count == 1
         assert_frame_equal(model.to_df(), single_row_df)
 
     def test_invalid_types(self) -> None:
@@ -105,7 +171,39 @@ class TestDatasetInput:
         # Check if index is preserved when converting back to DataFrame
         assert_frame_equal(result_df, df)
 
-    @pytest.mark.parametrize("input_type", ["df", "records"])
+    def test_preview(self, data: dict[str, Any]) -> None:
+        model = AnalystDataset(data=data["df"], name="test")
+        assert_frame_equal(model.preview(n=2), data["df"].head(2))
+        assert_frame_equal(model.preview(["b"], n=2), data["df"][["b"]].head(2))
+        assert_frame_equal(model.preview(n=10), data["df"])
+
+    @pytest.mark.parametrize("input_type", ["df", "records", "columns"])
     def test_different_input_types(self, input_type: str, data: dict[str, Any]) -> None:
         model = AnalystDataset(data=data[input_type], name="test")
         assert_frame_equal(model.to_df(), data["df"])
+
+
+class TestDictionaryGeneration:
+    def test_description_count_mismatch(self) -> None:
+        with pytest.raises(
+            ValidationError,
+            match=r"Number of descriptions \(2\) must match number of columns \(1\)",
+        ):
+            DictionaryGeneration(
+                columns=["a"], descriptions=["First column here", "Second column here"]
+            )
+
+    @pytest.mark.parametrize(
+        "columns, message",
+        [
+            (["a", "b", "a"], "Duplicate column names are not allowed"),
+            (["a", ""], "Each column name must be a non-empty string"),
+            (["a", None], "Input should be a valid string"),
+        ],
+        ids=["duplicate", "empty", "non-str"],
+    )
+    def test_rejects_invalid_columns(self, columns: list[Any], message: str) -> None:
+        with pytest.raises(ValidationError, match=message):
+            DictionaryGeneration(
+                columns=columns, descriptions=["A long enough description"] * 3
+            )
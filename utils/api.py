@@ -227,11 +227,9 @@ def download_catalog_datasets(*args: Any) -> list[AnalystDataset]:
     result_datasets: list[AnalystDataset] = []
     for dataset in datasets:
         try:
-            df_records = cast(
-                list[dict[str, Any]],
-                dataset.get_as_dataframe().to_dict(orient="records"),
+            result_datasets.append(
+                AnalystDataset(name=dataset.name, data=dataset.get_as_dataframe())
             )
-            result_datasets.append(AnalystDataset(name=dataset.name, data=df_records))
             logger.info(f"Successfully downloaded {dataset.name}")
         except Exception as e:
             logger.error(f"Failed to read dataset {dataset.name}: {str(e)}")
@@ -318,10 +316,10 @@ async def _get_dictionary_batch(
 
         # Only return descriptions for requested columns
         return [
-            DataDictionaryColumn(
-                column=col,
-                description=descriptions.get(col, "No description available"),
-                data_type=str(df[col].dtype),
+            DataDictionaryColumn.from_frame(
+                col,
+                str(df[col].dtype),
+                descriptions.get(col, "No description available"),
             )
             for col in columns
         ]
@@ -329,10 +327,8 @@ async def _get_dictionary_batch(
     except ValueError as e:
         logger.error(f"Invalid dictionary response: {str(e)}")
         return [
-            DataDictionaryColumn(
-                column=col,
-                description="No valid description available",
-                data_type=str(df[col].dtype),
+            DataDictionaryColumn.from_frame(
+                col, str(df[col].dtype), "No valid description available"
             )
             for col in columns
         ]
@@ -725,7 +721,9 @@ async def cleanse_dataframes(
 
     for dataset in datasets:
         report: list[CleansedColumnReport] = []
-        cleaned_df: DataFrame = dataset.to_df()
+        # Converted columns are swapped into a shallow copy, so the input
+        # dataset is left untouched without copying every column up front
+        cleaned_df: DataFrame = dataset.to_df().copy(deep=False)
 
         sample_df = cleaned_df.sample(min(100, len(cleaned_df)))
         if cleaned_df.empty:
@@ -737,7 +735,10 @@ async def cleanse_dataframes(
             cleaned_column_name = re.sub(r"\s+", " ", str(column_name).strip())
             original_nulls = sample_df[column_name].isna()
 
-            column_report = CleansedColumnReport(new_column_name=cleaned_column_name)
+            # The name is built here, so skip validation for the per-column report
+            column_report = CleansedColumnReport.model_construct(
+                new_column_name=cleaned_column_name
+            )
             if cleaned_column_name != column_name:
                 column_report.original_column_name = column_name
                 column_report.warnings.append(
@@ -765,15 +766,19 @@ async def cleanse_dataframes(
 
                         if success:
                             cleaned_df[column_name] = cleaned_series
-                            column_report.new_dtype = str(cleaned_series.dtype)
+                            column_report.new_dtype = sys.intern(
+                                str(cleaned_series.dtype)
+                            )
                             column_report.conversion_type = conversion_type
                             break
                 except Exception as e:
                     column_report.errors.append(str(e))
 
-            cleaned_df = cleaned_df.rename(columns={column_name: cleaned_column_name})
             report.append(column_report)
 
+        # Rename all columns at once; rename() inside the loop copied the whole
+        # frame once per column
+        cleaned_df.columns = pd.Index([r.new_column_name for r in report])
         add_summary_statistics(cleaned_df, report)
 
         cleaned_datasets.append(
@@ -817,10 +822,8 @@ async def get_dictionaries(datasets: list[AnalystDataset]) -> list[DataDictionar
             DataDictionary(
                 name=dataset.name,
                 column_descriptions=[
-                    DataDictionaryColumn(
-                        column=c,
-                        data_type=str(dataset.to_df()[c].dtype),
-                        description="No Description Available",
+                    DataDictionaryColumn.from_frame(
+                        c, str(dataset.to_df()[c].dtype), "No Description Available"
                     )
                     for c in dataset.columns
                 ],
@@ -909,8 +912,8 @@ async def _run_charts(
     return RunChartsResult(
         status="success",
         code=code,
-        fig1_json=result.fig1.to_json(),
-        fig2_json=result.fig2.to_json(),
+        fig1_json=result.fig1_json,
+        fig2_json=result.fig2_json,
         metadata=RunAnalysisResultMetadata(
             duration=duration.total_seconds(),
             attempts=len(exception_history) + 1,
@@ -344,8 +344,7 @@ class SnowflakeOperator(DatabaseOperator[SnowflakeCredentialArgs]):
                         logger.info(
                             f"Successfully loaded table {table}: {len(df)} rows, {len(df.columns)} columns"
                         )
-                        data = cast(list[dict[str, Any]], df.to_dict("records"))
-                        dataframes.append(AnalystDataset(name=table, data=data))
+                        dataframes.append(AnalystDataset(name=table, data=df))
 
                     except Exception as e:
                         logger.error(f"Error loading table {table}: {str(e)}")
@@ -496,8 +495,7 @@ class BigQueryOperator(DatabaseOperator[BigQueryCredentialArgs]):
                         logger.info(
                             f"Successfully loaded table {table}: {len(df)} rows, {len(df.columns)} columns"
                         )
-                        data = cast(list[dict[str, Any]], df.to_dict("records"))
-                        dataframes.append(AnalystDataset(name=table, data=data))
+                        dataframes.append(AnalystDataset(name=table, data=df))
 
                     except Exception as e:
                         logger.error(f"Error loading table {table}: {str(e)}")
@@ -14,11 +14,14 @@
 
 from __future__ import annotations
 
-import json
+import sys
+from operator import attrgetter
 from typing import Any, Callable, Generator, Literal
 
+import orjson
 import pandas as pd
 import plotly.graph_objects as go
+import pyarrow as pa
 from openai.types.chat.chat_completion_assistant_message_param import (
     ChatCompletionAssistantMessageParam,
 )
@@ -29,11 +32,13 @@ from openai.types.chat.chat_completion_system_message_param import (
 from openai.types.chat.chat_completion_user_message_param import (
     ChatCompletionUserMessageParam,
 )
+from pandas.api.extensions import ExtensionDtype
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
     GetJsonSchemaHandler,
+    PrivateAttr,
     ValidationInfo,
     computed_field,
     field_validator,
@@ -55,14 +60,116 @@ class AiCatalogDataset(BaseModel):
     size: str
 
 
+def _dataframe_wrapper_from_ipc(payload: bytes) -> DataFrameWrapper:
+    with pa.ipc.open_stream(payload) as reader:
+        return DataFrameWrapper(reader.read_pandas())
+
+
+def _frame_from_records(records: Any) -> pd.DataFrame:
+    # The plain constructor takes the fast dict-to-block path for rows of dicts;
+    # from_records stays for the other row shapes it understands
+    if isinstance(records, dict):
+        return pd.DataFrame(records, copy=False)
+    if isinstance(records, list) and all(isinstance(row, dict) for row in records):
+        return pd.DataFrame(records)
+    return pd.DataFrame.from_records(records)
+
+
+# Arrow types that an object column comes back from as the same Python values
+_OBJECT_ARROW_TYPES = (
+    pa.types.is_string,
+    pa.types.is_large_string,
+    pa.types.is_binary,
+    pa.types.is_large_binary,
+    pa.types.is_null,
+)
+
+
+def _arrow_roundtrips(df: pd.DataFrame, schema: pa.Schema) -> bool:
+    if any(pa.types.is_nested(field.type) for field in schema):
+        return False
+    # Data columns lead the schema in frame order; an object column inferred
+    # as a number, bool or date would come back with a different dtype
+    return all(
+        any(is_type(schema.field(i).type) for is_type in _OBJECT_ARROW_TYPES)
+        for i, dtype in enumerate(df.dtypes)
+        if pd.api.types.is_object_dtype(dtype)
+    )
+
+
 class DataFrameWrapper:
     def __init__(self, df: pd.DataFrame) -> None:
         self.df = df
+        self._records: list[dict[str, Any]] | None = None
+        self._records_frame: pd.DataFrame | None = None
+        self._columns: list[str] | None = None
+        self._columns_index: pd.Index | None = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the DataFrame as an Arrow IPC stream.
+
+        Arrow writes the column buffers as-is instead of pickling object columns
+        value by value. Frames that Arrow can't round-trip faithfully (non-str
+        or duplicate labels, nested values, or object columns holding anything
+        but strings and bytes) are pickled as plain DataFrames.
+        """
+        # Arrow stores column names as strings, so 2 would come back as "2"
+        if not all(type(c) is str for c in self.df.columns):
+            return (DataFrameWrapper, (self.df,))
+        try:
+            table = pa.Table.from_pandas(self.df)
+        except (pa.ArrowException, ValueError):
+            return (DataFrameWrapper, (self.df,))
+        if not _arrow_roundtrips(self.df, table.schema):
+            return (DataFrameWrapper, (self.df,))
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return (_dataframe_wrapper_from_ipc, (sink.getvalue().to_pybytes(),))
 
     def to_dict(self) -> list[dict[str, Any]]:
-        records = self.df.to_dict(orient="records")
-        records_str = [{str(k): v for k, v in record.items()} for record in records]
-        return records_str
+        """Return the rows as records, reused across serializations.
+
+        The cached records are a full copy of the rows as Python objects and
+        live as long as the wrapper; they are rebuilt when the frame is replaced
+        and dropped by clear_records() when it may be modified in place.
+        """
+        if self._records is None or self._records_frame is not self.df:
+            self._records = self._build_records()
+            self._records_frame = self.df
+        return self._records
+
+    def clear_records(self) -> None:
+        self._records = None
+        self._records_frame = None
+
+    def column_names(self) -> list[str]:
+        # pandas swaps in a new Index whenever columns are added or renamed
+        index = self.df.columns
+        if self._columns is None or self._columns_index is not index:
+            self._columns = index.tolist()
+            self._columns_index = index
+        return self._columns
+
+    def _build_records(self) -> list[dict[str, Any]]:
+        columns = self.df.columns.tolist()
+        # Labels are almost always str already; only coerce when they aren't
+        if not all(type(c) is str for c in columns):
+            columns = [str(c) for c in columns]
+        # Series.tolist() converts a whole column to Python scalars at once;
+        # zipping the columns builds each record without an intermediate dict
+        values = []
+        for _, series in self.df.items():
+            column = series.tolist()
+            # Like DataFrame.to_dict, report pd.NA from nullable dtypes as None
+            if isinstance(series.dtype, ExtensionDtype) and series.hasnans:
+                column = [None if v is pd.NA else v for v in column]
+            values.append(column)
+        if not values:
+            return []
+        dict_, zip_ = dict, zip
+        return [dict_(zip_(columns, row)) for row in zip_(*values)]
 
     @classmethod
     def __get_validators__(
@@ -79,13 +186,24 @@ class DataFrameWrapper:
             return cls(v)
         elif isinstance(v, list):
             try:
-                df = pd.DataFrame.from_records(v)
+                df = _frame_from_records(v)
                 return cls(df)
             except Exception as e:
                 raise ValueError(
                     "Invalid data format; expecting a list of records"
                 ) from e
-        raise ValueError("data must be either a pandas DataFrame or a list of records")
+        elif isinstance(v, dict) and all(isinstance(col, list) for col in v.values()):
+            # Column-oriented input maps straight onto the DataFrame's columns
+            try:
+                df = _frame_from_records(v)
+                return cls(df)
+            except Exception as e:
+                raise ValueError(
+                    "Invalid data format; expecting a dict of equal-length columns"
+                ) from e
+        raise ValueError(
+            "data must be a pandas DataFrame, a list of records or a dict of columns"
+        )
 
     @classmethod
     def __get_pydantic_json_schema__(
@@ -133,7 +251,7 @@ class AnalystDataset(BaseModel):
         if "data" not in values and "data_records" in values:
             try:
                 records = values["data_records"]
-                df = pd.DataFrame.from_records(records)
+                df = _frame_from_records(records)
                 # Wrap the DataFrame before storing it.
                 values["data"] = DataFrameWrapper(df)
             except Exception as e:
@@ -143,12 +261,29 @@ class AnalystDataset(BaseModel):
         return values
 
     def to_df(self) -> pd.DataFrame:
-        """Return the internal pandas DataFrame."""
+        """Return the internal pandas DataFrame.
+
+        Callers (including generated analysis code) may modify the frame in
+        place, so the cached records are dropped.
+        """
+        self.data.clear_records()
         return self.data.df
 
+    def preview(self, columns: list[str] | None = None, n: int = 10) -> pd.DataFrame:
+        """Return the first n rows, optionally restricted to the given columns.
+
+        Rows are sliced before columns are selected, so only n rows are copied.
+        """
+        head = self.data.df.head(n)
+        return head if columns is None else head[columns]
+
     @property
     def columns(self) -> list[str]:
-        return self.data.df.columns.tolist()
+        return self.data.column_names()
+
+    @property
+    def row_count(self) -> int:
+        return len(self.data.df)
 
 
 class CleansedColumnReport(BaseModel):
@@ -178,6 +313,25 @@ class DataDictionaryColumn(BaseModel):
     column: str
     description: str
 
+    @classmethod
+    def from_frame(
+        cls, column: Any, data_type: str, description: str
+    ) -> "DataDictionaryColumn":
+        """Build an entry from a DataFrame column label and dtype name.
+
+        These values come straight from pandas, so validation is skipped; the
+        label is coerced to str as in DataFrameWrapper records, and the dtype
+        name is interned since only a handful of distinct ones occur.
+        """
+        return cls.model_construct(
+            column=str(column),
+            description=description,
+            data_type=sys.intern(data_type),
+        )
+
+
+_application_fields = attrgetter("column", "description", "data_type")
+
 
 class DataDictionary(BaseModel):
     name: str
@@ -193,12 +347,10 @@ class DataDictionary(BaseModel):
         return DataDictionary(
             name=name,
             column_descriptions=[
-                DataDictionaryColumn(
-                    column=col,
-                    description=column_descriptions,
-                    data_type=str(df[col].dtype),
+                DataDictionaryColumn.from_frame(col, data_type, column_descriptions)
+                for col, data_type in zip(
+                    df.columns.tolist(), df.dtypes.astype(str).tolist()
                 )
-                for col in df.columns
             ],
         )
 
@@ -210,23 +362,35 @@ class DataDictionary(BaseModel):
         if not columns.issubset(df.columns):
             raise ValueError(f"DataFrame must contain columns: {columns}")
 
+        # Only a handful of distinct dtype names occur, so share one copy of
+        # each; anything that isn't a str is left for validation to reject
+        data_types = [
+            sys.intern(dtype) if isinstance(dtype, str) else dtype
+            for dtype in df["data_type"].tolist()
+        ]
+
+        # Read the three columns as plain lists rather than boxing each row
+        # into a Series with iterrows()
         column_descriptions = [
             DataDictionaryColumn(
-                column=row["column"],
-                description=row["description"],
-                data_type=row["data_type"],
+                column=column, description=description, data_type=dtype
+            )
+            for column, description, dtype in zip(
+                df["column"].tolist(), df["description"].tolist(), data_types
             )
-            for _, row in df.iterrows()
         ]
 
         return DataDictionary(name=name, column_descriptions=column_descriptions)
 
     def to_application_df(self) -> pd.DataFrame:
+        # Transpose the column descriptions in a single pass
+        rows = map(_application_fields, self.column_descriptions)
+        columns, descriptions, data_types = list(zip(*rows)) or ((), (), ())
         return pd.DataFrame(
             {
-                "column": [c.column for c in self.column_descriptions],
-                "description": [c.description for c in self.column_descriptions],
-                "data_type": [c.data_type for c in self.column_descriptions],
+                "column": list(columns),
+                "description": list(descriptions),
+                "data_type": list(data_types),
             }
         )
 
@@ -249,20 +413,21 @@ class DictionaryGeneration(BaseModel):
     @classmethod
     def validate_descriptions(cls, v: Any, values: Any) -> Any:
         # Check if columns exists in values
-        if "columns" not in values.data:
+        columns = values.data.get("columns")
+        if columns is None:
             raise ValueError("Columns must be provided before descriptions")
 
         # Check if lengths match
-        if len(v) != len(values.data["columns"]):
+        if len(v) != len(columns):
             raise ValueError(
-                f"Number of descriptions ({len(v)}) must match number of columns ({len(values['columns'])})"
+                f"Number of descriptions ({len(v)}) must match number of columns ({len(columns)})"
             )
 
-        # Validate each description
+        # Validate each description, working out which rule failed only on failure
         for desc in v:
-            if not desc or not isinstance(desc, str):
-                raise ValueError("Each description must be a non-empty string")
-            if len(desc.strip()) < 10:
+            if not isinstance(desc, str) or len(desc.strip()) < 10:
+                if not desc or not isinstance(desc, str):
+                    raise ValueError("Each description must be a non-empty string")
                 raise ValueError("Descriptions must be at least 10 characters long")
 
         return v
@@ -273,14 +438,14 @@ class DictionaryGeneration(BaseModel):
         if not v:
             raise ValueError("Columns list cannot be empty")
 
-        # Check for duplicates
-        if len(v) != len(set(v)):
-            raise ValueError("Duplicate column names are not allowed")
-
-        # Validate each column name
+        # Validate each column name and check for duplicates in one pass
+        seen: set[str] = set()
         for col in v:
             if not col or not isinstance(col, str):
                 raise ValueError("Each column name must be a non-empty string")
+            if col in seen:
+                raise ValueError("Duplicate column names are not allowed")
+            seen.add(col)
 
         return v
 
@@ -331,21 +496,25 @@ class AnalysisError(BaseModel):
         cls,
         exception: MaxReflectionAttempts,
     ) -> "AnalysisError":
-        return AnalysisError(
-            exception_history=[
-                CodeExecutionError(
-                    exception_str=str(exception.exception),
-                    traceback_str=exception.traceback_str,
-                    code=exception.code,
-                    stdout=exception.stdout,
-                    stderr=exception.stderr,
+        history = exception.exception_history
+        if not history:
+            return AnalysisError(exception_history=history)
+
+        # The attempts were recorded in-process, so skip validating each entry
+        exception_history = []
+        for attempt in history:
+            if attempt is None:
+                continue
+            exception_history.append(
+                CodeExecutionError.model_construct(
+                    exception_str=str(attempt.exception),
+                    traceback_str=attempt.traceback_str,
+                    code=attempt.code,
+                    stdout=attempt.stdout,
+                    stderr=attempt.stderr,
                 )
-                for exception in exception.exception_history
-                if exception is not None
-            ]
-            if exception.exception_history is not None
-            else None,
-        )
+            )
+        return AnalysisError(exception_history=exception_history)
 
 
 class RunDatabaseAnalysisResultMetadata(BaseModel):
@@ -364,10 +533,26 @@ class RunDatabaseAnalysisResult(BaseModel):
 
 
 class ChartGenerationExecutionResult(BaseModel):
-    fig1: go.Figure
-    fig2: go.Figure
+    fig1_json: str
+    fig2_json: str
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    @model_validator(mode="before")
+    @classmethod
+    def serialize_figures(cls, values: Any) -> Any:
+        """
+        Generated chart code returns {"fig1": Figure, "fig2": Figure}; serialize
+        the figures once here into the JSON that RunChartsResult stores.
+        """
+        if not isinstance(values, dict):
+            return values
+        values = dict(values)
+        for key in ("fig1", "fig2"):
+            if key in values:
+                fig = values.pop(key)
+                if not isinstance(fig, go.Figure):
+                    raise ValueError(f"{key} must be a plotly Figure")
+                values[f"{key}_json"] = fig.to_json(engine="orjson")
+        return values
 
 
 class RunChartsRequest(BaseModel):
@@ -382,13 +567,21 @@ class RunChartsResult(BaseModel):
     code: str | None = None
     metadata: RunAnalysisResultMetadata
 
+    # Figures parsed from the JSON fields, built on first access
+    _fig1: go.Figure | None = PrivateAttr(default=None)
+    _fig2: go.Figure | None = PrivateAttr(default=None)
+
     @property
     def fig1(self) -> go.Figure | None:
-        return go.Figure(json.loads(self.fig1_json)) if self.fig1_json else None
+        if self._fig1 is None and self.fig1_json:
+            self._fig1 = go.Figure(orjson.loads(self.fig1_json))
+        return self._fig1
 
     @property
     def fig2(self) -> go.Figure | None:
-        return go.Figure(json.loads(self.fig2_json)) if self.fig2_json else None
+        if self._fig2 is None and self.fig2_json:
+            self._fig2 = go.Figure(orjson.loads(self.fig2_json))
+        return self._fig2
 
 
 class GetBusinessAnalysisMetadata(BaseModel):
@@ -474,6 +667,13 @@ class AppInfra(BaseModel):
 
 UserRoleType = Literal["assistant", "user", "system"]
 
+# One message param constructor per role; UserRoleType keeps this exhaustive
+_ROLE_MESSAGE_PARAMS: dict[str, Callable[..., ChatCompletionMessageParam]] = {
+    "user": ChatCompletionUserMessageParam,
+    "assistant": ChatCompletionAssistantMessageParam,
+    "system": ChatCompletionSystemMessageParam,
+}
+
 
 class Tool(BaseModel):
     name: str
@@ -497,13 +697,4 @@ class AnalystChatMessage(BaseModel):
     ]
 
     def to_openai_message_param(self) -> ChatCompletionMessageParam:
-        if self.role == "user":
-            return ChatCompletionUserMessageParam(role=self.role, content=self.content)
-        elif self.role == "assistant":
-            return ChatCompletionAssistantMessageParam(
-                role=self.role, content=self.content
-            )
-        elif self.role == "system":
-            return ChatCompletionSystemMessageParam(
-                role=self.role, content=self.content
-            )
\ No newline at end of file
+        return _ROLE_MESSAGE_PARAMS[self.role](role=self.role, content=self.content)
\ No newline at end of file